@@ -1,22 +1,56 @@
-from fastapi import Depends, HTTPException, status, Path
+from fastapi import Depends, HTTPException, status, Path, Request
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import jwt
+from jwt import PyJWTError
 from sqlalchemy.orm import Session
-from typing import List
+from cachetools import TTLCache
+import hashlib
+import threading
+from functools import lru_cache, wraps
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple
 from uuid import UUID
 
 from ..schemas import token as token_schema
-from ..db.base import SessionLocal
+from ..db.base import SessionLocal, ReadSessionLocal, engine, read_engine
 from ..db.models import User, ProjectMember, ProjectRole, Issue
 from ..core.config import settings
-from ..crud import crud_user, crud_member, crud_issue, crud_phase
+from ..crud import crud_user, crud_member, crud_phase
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/token")
 
+# Resolved once at import so token verification doesn't rebuild them per request
+_JWT_SECRET = settings.SECRET_KEY
+_JWT_ALGORITHMS = [settings.ALGORITHM]
+
+# Maps a verified token's SHA-256 digest to (user_id, expiry) so repeat
+# requests skip the JWT decode and the lookup by email. Keying on the digest
+# keeps raw bearer tokens out of process memory. The reverse index lets us
+# drop every cached token for a user, e.g. after a password change; it is
+# bounded like the cache itself, and an entry is rewritten whenever one of
+# the user's tokens is cached, so it outlives all of them.
+_TOKEN_CACHE_SIZE = 10_000
+_TOKEN_CACHE_TTL = 60
+_token_cache: TTLCache = TTLCache(maxsize=_TOKEN_CACHE_SIZE, ttl=_TOKEN_CACHE_TTL)
+_tokens_by_user: TTLCache = TTLCache(maxsize=_TOKEN_CACHE_SIZE, ttl=_TOKEN_CACHE_TTL)
+# get_current_user runs on threadpool threads and TTLCache isn't thread-safe,
+# so every access to the two caches above holds this lock
+_token_lock = threading.Lock()
+
+def invalidate_user_tokens(user_id: UUID) -> None:
+    """Drops all cached token verifications for the given user."""
+    with _token_lock:
+        for key in _tokens_by_user.pop(user_id, ()):
+            _token_cache.pop(key, None)
+
 def get_db():
     """
     Dependency function to get a database session.
     Yields a session for a single request-response cycle.
+    FastAPI caches this dependency per request, so every sub-dependency
+    (auth, role checks) and the endpoint itself share the same session.
+    CRUD functions only flush; each mutating endpoint commits once when its
+    unit of work is complete, and anything uncommitted is rolled back on close.
     """
     db = SessionLocal()
     try:
@@ -24,8 +58,54 @@ def get_db():
     finally:
         db.close()
 
+def _path_project_id(request: Request) -> UUID | None:
+    """Returns the `project_id` path parameter as a UUID, if there is a valid one."""
+    raw = request.path_params.get("project_id")
+    if raw is None:
+        return None
+    try:
+        return UUID(str(raw))
+    except ValueError:
+        return None
+
+def _load_user(
+    request: Request, db: Session, user_id: UUID | None = None, email: str | None = None
+) -> User | None:
+    """
+    Loads the current user by ID or email. On project-scoped routes the user's
+    membership is fetched in the same query and seeded into the per-request
+    membership cache, so the role check that follows needs no query of its own.
+    """
+    project_id = _path_project_id(request)
+    if project_id is None:
+        if user_id is not None:
+            return db.get(User, user_id)
+        return crud_user.get_user_by_email(db, email=email)
+
+    user, member = crud_member.get_user_with_membership(
+        db, project_id=project_id, user_id=user_id, email=email
+    )
+    if user is not None:
+        _project_member_cache(request)[(project_id, user.id)] = member
+    return user
+
+def get_db_ro(db: Session = Depends(get_db)):
+    """
+    Dependency to get a session for read-only endpoints.
+    Uses the read replica when DATABASE_READ_URL is set; otherwise it is the
+    request's regular session, so no second connection is taken.
+    """
+    if read_engine is engine:
+        yield db
+        return
+    ro_db = ReadSessionLocal()
+    try:
+        yield ro_db
+    finally:
+        ro_db.close()
+
 def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+    request: Request, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     """
     Dependency to get the current user from a JWT token.
@@ -36,20 +116,40 @@ def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with _token_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        user_id, expires_at = cached
+        if expires_at > datetime.now(timezone.utc).timestamp():
+            user = _load_user(request, db, user_id=user_id)
+            if user is not None:
+                return user
+        with _token_lock:
+            _token_cache.pop(cache_key, None)
+
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = jwt.decode(token, _JWT_SECRET, algorithms=_JWT_ALGORITHMS)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
         token_data = token_schema.TokenData(email=email)
-    except JWTError:
+    except PyJWTError:
         raise credentials_exception
         
-    user = crud_user.get_user_by_email(db, email=token_data.email)
+    user = _load_user(request, db, email=token_data.email)
     if user is None:
         raise credentials_exception
+
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        with _token_lock:
+            _token_cache[cache_key] = (user.id, expires_at)
+            # Forget this user's tokens the TTL cache has already evicted
+            keys = {key for key in _tokens_by_user.get(user.id, ()) if key in _token_cache}
+            keys.add(cache_key)
+            _tokens_by_user[user.id] = keys
     return user
 
 def get_project_member_from_path(
@@ -65,32 +165,70 @@ def get_project_member_from_path(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project member not found")
     return member
 
-def require_role(required_roles: List[ProjectRole]):
+class SuperuserMember(NamedTuple):
+    """
+    Lightweight stand-in for a ProjectMember returned by the role checks
+    when the current user is a superuser. Exposes the same attributes the
+    routers read, without constructing a mapped ORM instance.
+    """
+    user_id: UUID
+    project_id: UUID
+    role: ProjectRole
+    user: User
+
+def _project_member_cache(request: Request) -> dict:
+    """Returns the per-request (project_id, user_id) -> ProjectMember cache."""
+    if not hasattr(request.state, "project_member_cache"):
+        request.state.project_member_cache = {}
+    return request.state.project_member_cache
+
+def get_cached_project_member(
+    request: Request, db: Session, project_id: UUID, user_id: UUID
+) -> ProjectMember | None:
+    """
+    Looks up a project membership, memoized on `request.state` so repeated
+    role checks within the same request only hit the database once.
+    """
+    cache = _project_member_cache(request)
+    key = (project_id, user_id)
+    if key not in cache:
+        cache[key] = crud_member.get_project_member(db, project_id=project_id, user_id=user_id)
+    return cache[key]
+
+def _memoize_by_roles(factory):
+    """
+    Makes a role-check factory return the same dependency function for the
+    same set of roles. The role set is frozen once, and FastAPI recognises
+    repeated uses of one check in a route as a single dependency, so it runs
+    only once per request.
+    """
+    cached_factory = lru_cache(maxsize=None)(factory)
+
+    @wraps(factory)
+    def wrapper(required_roles: Iterable[ProjectRole]):
+        return cached_factory(frozenset(required_roles))
+    return wrapper
+
+@_memoize_by_roles
+def require_role(required_roles: frozenset[ProjectRole]):
     """
     Dependency that creates a dependency to check for required roles.
     Assumes `project_id` is in the URL path.
     """
     def get_current_member(
+        request: Request,
         project_id: UUID = Path(...),
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db)
-    ) -> ProjectMember:
+    ) -> ProjectMember | SuperuserMember:
         if current_user.is_superuser:
-            # Create a mock ProjectMember object for superusers with an Admin role
-            return ProjectMember(
-                user_id=current_user.id,
-                project_id=project_id,
-                role=ProjectRole.ADMIN,
-                user=current_user
-            )
-
-        member = crud_member.get_project_member(db, project_id=project_id, user_id=current_user.id)
+            # Superusers act as an Admin member of every project
+            return SuperuserMember(current_user.id, project_id, ProjectRole.ADMIN, current_user)
+
+        member = get_cached_project_member(request, db, project_id=project_id, user_id=current_user.id)
         if not member:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this project")
         
-        if ProjectRole.ADMIN in required_roles and member.user.is_superuser:
-            return member
-
         if member.role not in required_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"User role '{member.role.value}' is not authorized for this action")
             
@@ -111,59 +249,54 @@ def get_current_superuser(current_user: User = Depends(get_current_user)):
 
 # --- NEW DEPENDENCY TO FIX 422 ERROR ---
 
-def require_issue_role(required_roles: List[ProjectRole]):
+@_memoize_by_roles
+def require_issue_role(required_roles: frozenset[ProjectRole]):
     """
     Dependency factory to check roles based on an `issue_id` in the path.
-    It fetches the issue, finds its project, and then checks the user's role
-    for that project.
+    It resolves the issue's project and the user's membership in a single
+    query, then checks the user's role for that project.
     """
     def get_member_from_issue_path(
+        request: Request,
         issue_id: UUID = Path(...),
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db)
-    ) -> ProjectMember:
+    ) -> ProjectMember | SuperuserMember:
         
-        # 1. Get the issue from the path
-        issue = crud_issue.get_issue(db, issue_id=issue_id)
-        if not issue:
+        # 1. Resolve the issue's project and the user's membership in one query
+        project_id, member = crud_member.get_member_for_issue(db, issue_id=issue_id, user_id=current_user.id)
+        if project_id is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Issue not found")
-        
-        # 2. Get the project_id from the issue
-        project_id = issue.project_id
+
+        # 2. Share the membership with any later role check in this request
+        _project_member_cache(request)[(project_id, current_user.id)] = member
 
         # 3. Check role (similar logic to `require_role`)
         if current_user.is_superuser:
-            return ProjectMember(
-                user_id=current_user.id,
-                project_id=project_id,
-                role=ProjectRole.ADMIN,
-                user=current_user
-            )
-
-        member = crud_member.get_project_member(db, project_id=project_id, user_id=current_user.id)
+            return SuperuserMember(current_user.id, project_id, ProjectRole.ADMIN, current_user)
+
         if not member:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this project")
         
-        if ProjectRole.ADMIN in required_roles and member.user.is_superuser:
-            return member
-
         if member.role not in required_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"User role '{member.role.value}' is not authorized for this action")
             
         return member
     return get_member_from_issue_path
 
-def require_phase_role(required_roles: List[ProjectRole]):
+@_memoize_by_roles
+def require_phase_role(required_roles: frozenset[ProjectRole]):
     """
     Dependency factory to check roles based on a `phase_id` in the path.
     It fetches the phase, finds its project, and then checks the user's role
     for that project.
     """
     def get_member_from_phase_path(
+        request: Request,
         phase_id: UUID = Path(...),
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db)
-    ) -> ProjectMember:
+    ) -> ProjectMember | SuperuserMember:
         
         # 1. Get the phase from the path
         phase = crud_phase.get_phase(db, phase_id=phase_id)
@@ -175,20 +308,12 @@ def require_phase_role(required_roles: List[ProjectRole]):
 
         # 3. Check role (similar logic to `require_role`)
         if current_user.is_superuser:
-            return ProjectMember(
-                user_id=current_user.id,
-                project_id=project_id,
-                role=ProjectRole.ADMIN,
-                user=current_user
-            )
-
-        member = crud_member.get_project_member(db, project_id=project_id, user_id=current_user.id)
+            return SuperuserMember(current_user.id, project_id, ProjectRole.ADMIN, current_user)
+
+        member = get_cached_project_member(request, db, project_id=project_id, user_id=current_user.id)
         if not member:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this project")
         
-        if ProjectRole.ADMIN in required_roles and member.user.is_superuser:
-            return member
-
         if member.role not in required_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"User role '{member.role.value}' is not authorized for this action")
             
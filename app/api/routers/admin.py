@@ -1,64 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 import uuid
+import orjson
 
-from ...api.deps import get_db, get_current_superuser
+from ...db.base import SessionLocal
+from ...api.deps import get_db, get_current_superuser, invalidate_user_tokens
 from ...crud import crud_user, crud_admin
+from ...core.cache import users_list_cache, dashboard_cache, cache_get, cache_set, invalidate_users_list, invalidate_projects_lists, make_etag
 from ...schemas import user as user_schema
 from ...schemas import admin as admin_schema
 from ...db.models import User
 
-router = APIRouter()
+# Every admin endpoint requires a superuser
+router = APIRouter(dependencies=[Depends(get_current_superuser)])
 
 @router.get("/admin/dashboard-summary", response_model=admin_schema.ExecutiveDashboardResponse)
 def get_dashboard_summary(
+    request: Request,
+    response: Response,
+    # Cache fills read the primary; replica lag would otherwise be pinned
+    # in the cache for its whole window
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser),
 ):
     """
     Retrieve summary data for the admin executive dashboard.
     Admin only.
+    Computed at most once per cache window, however many clients poll it.
+    Answers 304 Not Modified if the client's If-None-Match matches the ETag.
     """
-    return crud_admin.get_dashboard_data(db)
+    cached = cache_get(dashboard_cache, "dashboard")
+    if cached is None:
+        dashboard = crud_admin.get_dashboard_data(db)
+        cached = cache_set(dashboard_cache, "dashboard", (make_etag([dashboard]), dashboard))
+    etag, dashboard = cached
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return dashboard
 # --- END OF NEW ENDPOINT ---
 
 @router.get("/admin/users", response_model=List[user_schema.User])
 def get_all_users(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: uuid.UUID | None = Query(None, description="Id of the last user of the previous page"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser),
 ):
     """
-    Retrieve all users. Admin only.
+    Retrieve users, paginated. Admin only.
+    Pass the id of the last user received as `cursor` to fetch the next page
+    without an offset scan; `skip` is ignored when a cursor is given.
+    Pages are served from a short-lived cache that user mutations invalidate.
+    Answers 304 Not Modified if the client's If-None-Match matches the ETag.
     """
-    return crud_user.get_users(db)
+    key = (skip, limit, cursor)
+    cached = cache_get(users_list_cache, key)
+    if cached is None:
+        users = [
+            user_schema.User.model_validate(user)
+            for user in crud_user.get_users(db, skip=skip, limit=limit, after=cursor)
+        ]
+        cached = cache_set(users_list_cache, key, (make_etag(users), users))
+    etag, users = cached
 
-@router.get("/admin/users", response_model=List[user_schema.User])
-def get_all_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser),
-):
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return users
+
+@router.get("/admin/users/export")
+def export_all_users():
     """
-    Retrieve all users. Admin only.
+    Stream every user as a JSON array. Admin only.
+    Users are read in batches and written out as they arrive, so memory
+    stays flat however many users there are.
     """
-    return crud_user.get_users(db)
+    def generate():
+        # The stream outlives the request's dependencies, so it uses its own session;
+        # on the primary, since long reads on a hot-standby replica can be cancelled
+        with SessionLocal() as db:
+            yield b"["
+            for i, user in enumerate(crud_user.iter_users(db)):
+                item = user_schema.User.model_validate(user).model_dump(mode="json")
+                yield (b"," if i else b"") + orjson.dumps(item)
+            yield b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 @router.post("/admin/users", response_model=user_schema.User, status_code=status.HTTP_201_CREATED)
 def create_new_user(
     user_in: user_schema.UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser),
 ):
     """
     Create new user. Admin only.
     """
-    user = crud_user.get_user_by_email(db, email=user_in.email)
-    if user:
+    user = crud_user.create_user(db, user_in=user_in)
+    if user is None:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
-    user = crud_user.create_user(db, user_in=user_in)
+    db.commit()
+    invalidate_users_list()
+    invalidate_projects_lists()
     return user
 
 @router.put("/admin/users/{user_id}", response_model=user_schema.User)
@@ -71,22 +121,19 @@ def update_user_privileges(
     """
     Update a user's privileges (e.g., make them a superuser). Admin only.
     """
-    db_user = crud_user.get_user(db, user_id=user_id)
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     # Prevent an admin from accidentally removing their own superuser status
-    if current_user.id == db_user.id and user_in.is_superuser is False: # Check for explicit False
+    if current_user.id == user_id and user_in.is_superuser is False: # Check for explicit False
         raise HTTPException(status_code=400, detail="Admins cannot remove their own superuser status.")
 
-    # Directly update the user object with the provided data
+    # Apply the provided data with a single UPDATE ... RETURNING
     update_data = user_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_user, field, value)
-    
-    db.add(db_user)
+    db_user = crud_user.update_user_fields(db, user_id=user_id, values=update_data)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
     db.commit()
-    db.refresh(db_user)
+    invalidate_users_list()
+    invalidate_projects_lists()
     
     return db_user
 
@@ -96,23 +143,33 @@ def update_user_details_by_admin(
     user_id: uuid.UUID,
     user_in: user_schema.UserAdminFullUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser),
 ):
     """
     Update a user's details (email, name, password). Admin only.
     """
-    db_user = crud_user.get_user(db, user_id=user_id)
-    if not db_user:
-        raise HTTPException(status_code=404, detail="User not found")
+    if user_in.email:
+        # Load the user and any current owner of the new email in one query
+        db_user, email_owner = crud_user.get_user_and_email_owner(db, user_id=user_id, email=user_in.email)
+        if not db_user:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    # If email is being changed, check if the new one is taken
-    if user_in.email and user_in.email != db_user.email:
-        existing_user = crud_user.get_user_by_email(db, email=user_in.email)
-        if existing_user:
+        # If email is being changed, check if the new one is taken
+        if email_owner and email_owner.id != db_user.id:
             raise HTTPException(status_code=400, detail="This email is already registered.")
 
-    # The updated crud_user.update_user function handles password hashing
-    return crud_user.update_user(db, db_user=db_user, user_in=user_in)
+        # The updated crud_user.update_user function handles password hashing
+        user = crud_user.update_user(db, db_user=db_user, user_in=user_in)
+    else:
+        # Nothing to check first, so update without loading the user
+        user = crud_user.update_user_by_id(db, user_id=user_id, user_in=user_in)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+    db.commit()
+    # Existing sessions must re-authenticate against the new email/password
+    invalidate_user_tokens(user_id)
+    invalidate_users_list()
+    invalidate_projects_lists()
+    return user
 
 
 @router.delete("/admin/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -132,4 +189,8 @@ def delete_user_by_id(
         raise HTTPException(status_code=404, detail="User not found")
     
     crud_user.delete_user(db, user_id=user_id)
-    return
\ No newline at end of file
+    db.commit()
+    invalidate_user_tokens(user_id)
+    invalidate_users_list()
+    invalidate_projects_lists()
+    return
@@ -1,14 +1,21 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from ...db.base import SessionLocal
 from ...schemas import issue as issue_schema
 from ...schemas.base import IssueStatus, IssueType
 from ...api.deps import get_db, get_current_user, require_role, require_issue_role
 from ...db.models import User, ProjectRole, ProjectMember
 from ...crud import crud_issue, crud_member
+from ...core.cache import invalidate_projects_lists
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+_LEAD_OR_ADMIN = frozenset({ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD})
+_LEAD_ONLY_ISSUE_TYPES = frozenset({IssueType.STORY, IssueType.EPIC})
 
 
 def check_admin_assignment(current_user: User, issue_in_assignee_id: UUID | None):
@@ -46,7 +53,7 @@ def create_new_issue(
     # Logic for Members
     if role == ProjectRole.MEMBER:
         # Members can only propose Tasks or Bugs
-        if issue_in.issue_type in [IssueType.STORY, IssueType.EPIC]:
+        if issue_in.issue_type in _LEAD_ONLY_ISSUE_TYPES:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Members can only propose Tasks or Bugs.")
         
         # Force status to PROPOSED and clear assignee
@@ -54,38 +61,72 @@ def create_new_issue(
         issue_in.assignee_id = None
         
     # Logic for Leads/Admins
-    elif role in [ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]:
+    elif role in _LEAD_OR_ADMIN:
         # If a lead creates an issue and leaves status as default 'PROPOSED',
         # automatically move it to 'TODO'
         if issue_in.status == IssueStatus.PROPOSED:
             issue_in.status = IssueStatus.TODO
 
     issue = crud_issue.create_issue(db, issue_in=issue_in, reporter_id=current_user.id)
+    db.commit()
+    invalidate_projects_lists()
     return issue
 
 @router.get("/project/{project_id}", response_model=List[issue_schema.Issue])
 def get_issues_for_project(
     project_id: UUID,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: UUID | None = Query(None, description="Id of the last issue of the previous page"),
     db: Session = Depends(get_db),
     # This dependency returns a ProjectMember object (or mock admin)
     current_member: ProjectMember = Depends(require_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD, ProjectRole.MEMBER])),
 ):
     """
-    Retrieve all issues for a given project.
+    Retrieve a page of issues for a given project.
     - Admins/Leads see all issues.
     - Members see all active issues + only their own proposals.
+    Pass the id of the last issue received as `cursor` to fetch the next page
+    without an offset scan; `skip` is ignored when a cursor is given.
     """
-    issues = crud_issue.get_issues_by_project(db, project_id=project_id)
-    
-    if current_member.role == ProjectRole.MEMBER:
-        # Filter list: show all non-proposed issues OR proposed issues they reported
-        return [
-            i for i in issues 
-            if i.status != IssueStatus.PROPOSED or i.reporter_id == current_member.user_id
-        ]
-    
-    # Admins and Project Leads see all issues
-    return issues
+    # Members only see proposed issues they reported; Admins and Project Leads see all
+    return crud_issue.get_issues_by_project(
+        db,
+        project_id=project_id,
+        skip=skip,
+        limit=limit,
+        viewer_id=current_member.user_id,
+        see_all_proposed=current_member.role != ProjectRole.MEMBER,
+        after=cursor,
+    )
+
+@router.get("/project/{project_id}/export")
+def export_issues_for_project(
+    project_id: UUID,
+    current_member: ProjectMember = Depends(require_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD, ProjectRole.MEMBER])),
+):
+    """
+    Stream every issue of a project as a JSON array, with the same
+    visibility rules as the paginated list. Issues are read in batches and
+    written out as they arrive, so memory stays flat for large projects.
+    """
+    viewer_id = current_member.user_id
+    see_all_proposed = current_member.role != ProjectRole.MEMBER
+
+    def generate():
+        # The stream outlives the request's dependencies, so it uses its own session;
+        # on the primary, since long reads on a hot-standby replica can be cancelled
+        with SessionLocal() as db:
+            yield b"["
+            issues = crud_issue.iter_issues_by_project(
+                db, project_id=project_id, viewer_id=viewer_id, see_all_proposed=see_all_proposed
+            )
+            for i, issue in enumerate(issues):
+                item = issue_schema.Issue.model_validate(issue).model_dump(mode="json")
+                yield (b"," if i else b"") + orjson.dumps(item)
+            yield b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 @router.put("/{issue_id}", response_model=issue_schema.Issue)
 def update_existing_issue(
@@ -98,7 +139,8 @@ def update_existing_issue(
     Update an issue.
     Accessible by Admins, Project Leads, or the issue's Assignee.
     """
-    issue = crud_issue.get_issue(db, issue_id=issue_id)
+    # Fetch the issue and the user's membership in its project together
+    issue, member = crud_issue.get_issue_with_member(db, issue_id=issue_id, user_id=current_user.id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
@@ -107,8 +149,6 @@ def update_existing_issue(
     check_admin_assignment(current_user, issue_in.assignee_id)
 
     # Check permissions
-    member = crud_member.get_project_member(db, project_id=issue.project_id, user_id=current_user.id)
-    
     is_admin = current_user.is_superuser
     is_lead = member and member.role == ProjectRole.PROJECT_LEAD
     is_assignee = issue.assignee_id == current_user.id
@@ -122,27 +162,26 @@ def update_existing_issue(
             raise HTTPException(status_code=403, detail="Only Admins or Project Leads can change issue type or assignee")
 
     updated_issue = crud_issue.update_issue(db, db_obj=issue, obj_in=issue_in)
+    db.commit()
+    invalidate_projects_lists()
     return updated_issue
 
-@router.delete("/{issue_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{issue_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_issue_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]))],
+)
 def delete_existing_issue(
     issue_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user), # Keep this for user context
 ):
     """
     Delete an issue. Only accessible by Admins or Project Leads.
+    The role dependency has already verified the issue exists.
     """
-    issue = crud_issue.get_issue(db, issue_id=issue_id)
-    if not issue:
-        raise HTTPException(status_code=404, detail="Issue not found")
-
-    # Use the require_role dependency to check permissions for the issue's project
-    # This is tricky since it's a factory. Let's use our new dependency.
-    project_permission_checker = require_issue_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD])
-    project_permission_checker(issue_id=issue_id, current_user=current_user, db=db)
-
     crud_issue.delete_issue(db, issue_id=issue_id)
+    db.commit()
+    invalidate_projects_lists()
     return
 
 # --- New Endpoints for Proposal & Assignment Workflows (UNCHANGED) ---
@@ -162,7 +201,10 @@ def approve_proposal(
         raise HTTPException(status_code=400, detail="Issue is not in proposed state")
 
     update_data = issue_schema.IssueUpdate(status=IssueStatus.TODO)
-    return crud_issue.update_issue(db, db_obj=issue, obj_in=update_data)
+    issue = crud_issue.update_issue(db, db_obj=issue, obj_in=update_data)
+    db.commit()
+    invalidate_projects_lists()
+    return issue
 
 @router.post("/issues/{issue_id}/reject-proposal", status_code=status.HTTP_204_NO_CONTENT)
 def reject_proposal(
@@ -179,6 +221,8 @@ def reject_proposal(
         raise HTTPException(status_code=400, detail="Issue is not in proposed state")
     
     crud_issue.delete_issue(db, issue_id=issue_id)
+    db.commit()
+    invalidate_projects_lists()
     return
 
 @router.post("/issues/{issue_id}/request-assignment", response_model=issue_schema.Issue)
@@ -188,15 +232,19 @@ def request_assignment(
     current_user: User = Depends(get_current_user),
 ):
     """Request to be assigned to an unassigned issue."""
-    issue = crud_issue.get_issue(db, issue_id=issue_id)
+    issue = crud_issue.request_issue(db, issue_id=issue_id, user_id=current_user.id)
     if not issue:
-        raise HTTPException(status_code=404, detail="Issue not found")
-    if issue.assignee_id:
-        raise HTTPException(status_code=400, detail="Issue is already assigned")
-    if issue.assignee_request_id:
+        # Nothing was updated; re-read the issue only to report why
+        issue = crud_issue.get_issue(db, issue_id=issue_id)
+        if not issue:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        if issue.assignee_id:
+            raise HTTPException(status_code=400, detail="Issue is already assigned")
         raise HTTPException(status_code=400, detail="An assignment request is already pending")
 
-    return crud_issue.request_issue(db, issue=issue, user=current_user)
+    db.commit()
+    invalidate_projects_lists()
+    return issue
 
 @router.post("/issues/{issue_id}/approve-assignment", response_model=issue_schema.Issue)
 def approve_assignment(
@@ -206,13 +254,14 @@ def approve_assignment(
     current_member: ProjectMember = Depends(require_issue_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD])),
 ):
     """Approve a pending assignment request."""
-    issue = crud_issue.get_issue(db, issue_id=issue_id)
+    # The role dependency has already verified the issue exists
+    issue = crud_issue.approve_request(db, issue_id=issue_id)
     if not issue:
-        raise HTTPException(status_code=404, detail="Issue not found")
-    if not issue.assignee_request_id:
         raise HTTPException(status_code=400, detail="No pending assignment request for this issue")
-    
-    return crud_issue.approve_request(db, issue=issue)
+
+    db.commit()
+    invalidate_projects_lists()
+    return issue
 
 @router.post("/issues/{issue_id}/reject-assignment", response_model=issue_schema.Issue)
 def reject_assignment(
@@ -222,10 +271,11 @@ def reject_assignment(
     current_member: ProjectMember = Depends(require_issue_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD])),
 ):
     """Reject a pending assignment request."""
-    issue = crud_issue.get_issue(db, issue_id=issue_id)
+    # The role dependency has already verified the issue exists
+    issue = crud_issue.reject_request(db, issue_id=issue_id)
     if not issue:
-        raise HTTPException(status_code=404, detail="Issue not found")
-    if not issue.assignee_request_id:
         raise HTTPException(status_code=400, detail="No pending assignment request for this issue")
-    
-    return crud_issue.reject_request(db, issue=issue)
\ No newline at end of file
+
+    db.commit()
+    invalidate_projects_lists()
+    return issue
\ No newline at end of file
@@ -7,6 +7,7 @@ from ...schemas import member as member_schema
 from ...db.models import ProjectMember, ProjectRole
 from ...api.deps import get_db, require_role, get_project_member_from_path
 from ...crud import crud_member,crud_user
+from ...core.cache import invalidate_projects_lists
 
 router = APIRouter()
 
@@ -51,18 +52,17 @@ def add_member_to_project(
     if not user_to_add:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User with this email not found")
 
-    existing_member = crud_member.get_project_member(db, project_id=project_id, user_id=user_to_add.id)
-    if existing_member:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is already a member of this project")
-    
     # If an Admin is adding a new Project Lead, demote the old one
     if member_in.role == ProjectRole.PROJECT_LEAD:
-        current_lead = db.query(ProjectMember).filter(ProjectMember.project_id == project_id, ProjectMember.role == ProjectRole.PROJECT_LEAD).first()
-        if current_lead:
-            current_lead.role = ProjectRole.MEMBER
-            db.add(current_lead)
+        crud_member.demote_project_leads(db, project_id=project_id)
 
+    # The insert is a no-op if the user is already a member; the pending
+    # demotion above is then discarded because we never commit.
     member = crud_member.add_project_member(db, project_id=project_id, user_id=user_to_add.id, role=member_in.role)
+    if member is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User is already a member of this project")
+    db.commit()
+    invalidate_projects_lists()
     return member
 
 
@@ -82,9 +82,7 @@ def update_project_member_role(
     """
     # Check if we're trying to demote the last project lead
     if member_to_update.role == ProjectRole.PROJECT_LEAD and member_update.role == ProjectRole.MEMBER:
-        members = crud_member.get_project_members(db, project_id=member_to_update.project_id)
-        project_leads = [m for m in members if m.role == ProjectRole.PROJECT_LEAD]
-        if len(project_leads) == 1:
+        if crud_member.count_leads(db, project_id=member_to_update.project_id) <= 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot demote the last Project Lead. Assign a new lead first."
@@ -96,6 +94,8 @@ def update_project_member_role(
         user_id=member_to_update.user_id, 
         new_role=member_update.role
     )
+    db.commit()
+    invalidate_projects_lists()
     return updated_member
 
 @router.delete(
@@ -113,9 +113,7 @@ def remove_member_from_project(
     """
     # Prevent removing the last Project Lead from a project
     if member_to_remove.role == ProjectRole.PROJECT_LEAD:
-        members = crud_member.get_project_members(db, project_id=member_to_remove.project_id)
-        project_leads = [m for m in members if m.role == ProjectRole.PROJECT_LEAD]
-        if len(project_leads) == 1:
+        if crud_member.count_leads(db, project_id=member_to_remove.project_id) <= 1:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot remove the last Project Lead from a project. Assign a new lead first."
@@ -126,5 +124,7 @@ def remove_member_from_project(
         project_id=member_to_remove.project_id, 
         user_id=member_to_remove.user_id
     )
+    db.commit()
+    invalidate_projects_lists()
     return
 
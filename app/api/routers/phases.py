@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Path
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
@@ -7,19 +7,36 @@ from ...schemas import phase as phase_schema
 from ...db.models import ProjectRole, PhaseStatus
 from ...api.deps import get_db, require_role, require_phase_role # <-- Import require_phase_role
 from ...crud import crud_phase, crud_project
+from ...core.cache import project_phases_cache, cache_get, cache_set, invalidate_project_phases, invalidate_projects_lists, make_etag
 
 router = APIRouter()
 
 @router.get("/projects/{project_id}/phases", response_model=List[phase_schema.Phase], dependencies=[Depends(require_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD, ProjectRole.MEMBER]))])
 def get_project_phases(
     project_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """
     Get all phases for a project, ordered.
     Accessible by any project member.
+    Served from a short-lived cache that the phase mutations below invalidate.
+    Answers 304 Not Modified if the client's If-None-Match matches the ETag.
     """
-    return crud_phase.get_phases_by_project(db, project_id=project_id)
+    cached = cache_get(project_phases_cache, project_id)
+    if cached is None:
+        phases = [
+            phase_schema.Phase.model_validate(phase)
+            for phase in crud_phase.get_phases_by_project(db, project_id=project_id)
+        ]
+        cached = cache_set(project_phases_cache, project_id, (make_etag(phases), phases))
+    etag, phases = cached
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return phases
 
 @router.post("/projects/{project_id}/phases", response_model=phase_schema.Phase, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]))])
 def create_new_phase(
@@ -31,7 +48,11 @@ def create_new_phase(
     Create a new phase for a project.
     Only accessible by Admins and Project Leads.
     """
-    return crud_phase.create_phase(db, project_id=project_id, phase_in=phase_in)
+    phase = crud_phase.create_phase(db, project_id=project_id, phase_in=phase_in)
+    db.commit()
+    invalidate_project_phases(project_id)
+    invalidate_projects_lists()
+    return phase
 
 @router.put("/phases/{phase_id}", response_model=phase_schema.Phase, dependencies=[Depends(require_phase_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]))]) # <-- FIXED
 def update_phase_details(
@@ -47,7 +68,11 @@ def update_phase_details(
     if not db_phase:
         raise HTTPException(status_code=404, detail="Phase not found")
     
-    return crud_phase.update_phase(db, db_phase=db_phase, phase_in=phase_in)
+    phase = crud_phase.update_phase(db, db_phase=db_phase, phase_in=phase_in)
+    db.commit()
+    invalidate_project_phases(phase.project_id)
+    invalidate_projects_lists()
+    return phase
 
 @router.put("/projects/{project_id}/phases/reorder", response_model=List[phase_schema.Phase], dependencies=[Depends(require_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]))])
 def reorder_phases(
@@ -59,7 +84,11 @@ def reorder_phases(
     Updates the order of all phases for a project.
     Only accessible by Admins and Project Leads.
     """
-    return crud_phase.update_phases_order(db, project_id=project_id, order_updates=order_updates)
+    phases = crud_phase.update_phases_order(db, project_id=project_id, order_updates=order_updates)
+    db.commit()
+    invalidate_project_phases(project_id)
+    invalidate_projects_lists()
+    return phases
     
 @router.delete("/phases/{phase_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_phase_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]))]) # <-- FIXED
 def delete_phase(
@@ -75,6 +104,9 @@ def delete_phase(
         raise HTTPException(status_code=404, detail="Phase not found")
         
     crud_phase.delete_phase(db, phase_id=phase_id)
+    db.commit()
+    invalidate_project_phases(db_phase.project_id)
+    invalidate_projects_lists()
     return
 
 @router.post("/phases/{phase_id}/start", response_model=phase_schema.Phase, dependencies=[Depends(require_phase_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]))]) # <-- FIXED
@@ -90,7 +122,11 @@ def start_phase(
     if db_phase.status == PhaseStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Cannot start a phase that is already completed.")
 
-    return crud_phase.start_phase(db, db_phase=db_phase)
+    phase = crud_phase.start_phase(db, db_phase=db_phase)
+    db.commit()
+    invalidate_project_phases(phase.project_id)
+    invalidate_projects_lists()
+    return phase
 
 @router.post("/phases/{phase_id}/complete", response_model=phase_schema.Phase, dependencies=[Depends(require_phase_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD]))]) # <-- FIXED
 def complete_phase(
@@ -102,4 +138,8 @@ def complete_phase(
     if not db_phase:
         raise HTTPException(status_code=404, detail="Phase not found")
         
-    return crud_phase.complete_phase(db, db_phase=db_phase)
\ No newline at end of file
+    phase = crud_phase.complete_phase(db, db_phase=db_phase)
+    db.commit()
+    invalidate_project_phases(phase.project_id)
+    invalidate_projects_lists()
+    return phase
\ No newline at end of file
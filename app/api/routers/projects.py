@@ -1,29 +1,68 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from ...schemas import project as project_schema
-from ...api.deps import get_db, get_current_user, require_role, get_current_superuser
+from ...db.base import SessionLocal
+from ...api.deps import get_db, get_db_ro, get_current_user, require_role, get_current_superuser
 from ...db.models import User, ProjectRole
 from ...crud import crud_project
+from ...core.cache import projects_list_cache, cache_get, cache_set, invalidate_project_phases, invalidate_projects_lists
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+# Serializes project lists straight to JSON; built once at import
+_project_list_adapter = TypeAdapter(List[project_schema.ProjectWithDetails])
 
 
 @router.get("", response_model=List[project_schema.ProjectWithDetails])
 def get_user_projects(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    # Cache fills read the primary; replica lag would otherwise be pinned
+    # in the cache for its whole window
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Retrieve all projects the current user is a member of.
     Admins see all projects for overview purposes.
+    The projects are already validated response schemas, so they're dumped
+    to JSON directly rather than round-tripped through dicts and validated
+    again against the response model. The JSON is cached per user and page
+    until a mutation invalidates it.
     """
-    if current_user.is_superuser:
-        # FIX: Admin now sees ALL projects for full visibility
-        projects = crud_project.get_all_projects(db)
-    else:
-        projects = crud_project.get_projects_for_user(db, user_id=current_user.id)
-    return projects
+    key = (None if current_user.is_superuser else current_user.id, skip, limit)
+    payload = cache_get(projects_list_cache, key)
+    if payload is None:
+        if current_user.is_superuser:
+            # FIX: Admin now sees ALL projects for full visibility
+            projects = crud_project.get_all_projects(db, skip=skip, limit=limit)
+        else:
+            projects = crud_project.get_projects_for_user(db, user_id=current_user.id, skip=skip, limit=limit)
+        payload = cache_set(projects_list_cache, key, _project_list_adapter.dump_json(projects))
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/export", dependencies=[Depends(get_current_superuser)])
+def export_all_projects():
+    """
+    Stream every project with its details as a JSON array. Only accessible by
+    superusers. Projects are read in batches and written out as they arrive,
+    so memory stays flat however many projects there are.
+    """
+    def generate():
+        # The stream outlives the request's dependencies, so it uses its own session;
+        # on the primary, since long reads on a hot-standby replica can be cancelled
+        with SessionLocal() as db:
+            yield b"["
+            for i, project in enumerate(crud_project.iter_all_projects(db)):
+                yield (b"," if i else b"") + project.model_dump_json().encode()
+            yield b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @router.post("", response_model=project_schema.Project, status_code=status.HTTP_201_CREATED)
@@ -37,13 +76,15 @@ def create_new_project(
     Only accessible by superusers (admins).
     """
     project = crud_project.create_project(db, project_in=project_in, admin_user_id=current_user.id)
+    db.commit()
+    invalidate_projects_lists()
     return project
 
 
 @router.get("/{project_id}", response_model=project_schema.Project, dependencies=[Depends(require_role([ProjectRole.ADMIN, ProjectRole.PROJECT_LEAD, ProjectRole.MEMBER]))])
 def get_single_project(
-    project_id: str,
-    db: Session = Depends(get_db),
+    project_id: UUID,
+    db: Session = Depends(get_db_ro),
 ):
     """
     Retrieve a single project by its ID. User must be a member.
@@ -56,7 +97,7 @@ def get_single_project(
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_superuser)])
 def delete_project(
-    project_id: str,
+    project_id: UUID,
     db: Session = Depends(get_db),
 ):
     """
@@ -64,7 +105,10 @@ def delete_project(
     """
     project = crud_project.get_project(db, project_id=project_id)
     if not project:
-        raise HTTPException(status_code=status.HTTP_404, detail="Project not found")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
     crud_project.delete_project(db, project_id=project_id)
+    db.commit()
+    invalidate_project_phases(project.id)
+    invalidate_projects_lists()
     return
\ No newline at end of file
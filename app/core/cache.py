@@ -0,0 +1,60 @@
+from cachetools import TTLCache
+from pydantic import BaseModel
+from typing import Any, Hashable
+from uuid import UUID
+import hashlib
+import threading
+import orjson
+
+# In-process caches for read endpoints that are polled often but change
+# rarely. Entries hold (etag, validated response schemas) or serialized JSON,
+# never ORM objects, so they are safe to share across sessions. Mutations in this process
+# invalidate them immediately; other worker processes see changes once the
+# TTL expires.
+_RESPONSE_TTL_SECONDS = 30
+
+users_list_cache: TTLCache = TTLCache(maxsize=256, ttl=_RESPONSE_TTL_SECONDS)
+project_phases_cache: TTLCache = TTLCache(maxsize=1024, ttl=_RESPONSE_TTL_SECONDS)
+# Project list pages as JSON bytes, keyed by (user id or None for the
+# superuser view, skip, limit). They embed issues, members, phases and users,
+# so any mutation to those clears the whole cache.
+projects_list_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_RESPONSE_TTL_SECONDS)
+# The dashboard aggregates every table, so it is not invalidated explicitly;
+# a short TTL bounds how stale it can get.
+dashboard_cache: TTLCache = TTLCache(maxsize=1, ttl=15)
+
+# Sync endpoints use these caches from threadpool threads and TTLCache isn't
+# thread-safe, so every access goes through the helpers below, which hold
+# this lock. Values are computed outside it.
+_lock = threading.Lock()
+
+def cache_get(cache: TTLCache, key: Hashable) -> Any:
+    """Returns the cached value for `key`, or None if absent or expired."""
+    with _lock:
+        return cache.get(key)
+
+def cache_set(cache: TTLCache, key: Hashable, value: Any) -> Any:
+    """Stores `value` under `key` and returns it."""
+    with _lock:
+        cache[key] = value
+    return value
+
+def invalidate_users_list() -> None:
+    """Drops every cached page of the admin user list."""
+    with _lock:
+        users_list_cache.clear()
+
+def invalidate_project_phases(project_id: UUID) -> None:
+    """Drops the cached phase list of a project."""
+    with _lock:
+        project_phases_cache.pop(project_id, None)
+
+def invalidate_projects_lists() -> None:
+    """Drops every cached page of every user's project list."""
+    with _lock:
+        projects_list_cache.clear()
+
+def make_etag(items: list[BaseModel]) -> str:
+    """Builds a weak ETag from the JSON content of a list response."""
+    payload = orjson.dumps([item.model_dump(mode="json") for item in items])
+    return f'W/"{hashlib.sha1(payload).hexdigest()}"'
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -5,12 +6,45 @@ class Settings(BaseSettings):
     Loads and validates application settings from the environment.
     """
     DATABASE_URL: str
+    # Optional read replica for read-only endpoints; defaults to DATABASE_URL
+    DATABASE_READ_URL: str | None = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Argon2id cost parameters (memory in KiB). Changing them upgrades stored
+    # hashes on each user's next login.
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 2
+    # Number of worker threads FastAPI runs sync endpoints and dependencies on.
+    THREADPOOL_SIZE: int = 40
+    # Per worker process and per engine: each worker opens up to
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW connections to the primary, and as many
+    # again to the replica if DATABASE_READ_URL is set. Keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the database's (or
+    # pooler's) connection limit; threads beyond that wait for a connection.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    # Seconds before a pooled connection is replaced, ahead of server-side
+    # idle timeouts (e.g. Supabase).
+    DB_POOL_RECYCLE: int = 1800
+    # Server-side limit for a single statement, in milliseconds; a runaway
+    # query fails instead of holding a pooled connection. Unset means no limit.
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+    # Create tables and the default admin in every worker at startup. Turn
+    # off once deploys run `python -m app.db.bootstrap` instead.
+    BOOTSTRAP_ON_STARTUP: bool = True
 
     class Config:
         env_file = ".env"
 
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Returns the process-wide settings instance, reading the environment
+    only on the first call. Usable as a FastAPI dependency.
+    """
+    return Settings()
+
 # Create a single, reusable instance of the settings
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
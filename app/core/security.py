@@ -1,35 +1,63 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHash, VerificationError
 from sqlalchemy.orm import Session
 
 from .config import settings
 from ..db.models import User
 from ..crud import crud_user
 
-# Use Argon2 for password hashing
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Use Argon2id for password hashing, calling argon2-cffi directly rather than
+# through passlib. Existing passlib-generated hashes use the same encoding.
+# The defaults (64 MiB, 2 passes, 2 lanes) keep the hash costly for attackers
+# while holding down CPU per login; they can be tuned per deployment. Hashes
+# made with other parameters are upgraded on the user's next successful login.
+password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# Token settings resolved once at import instead of on every token issued
+_JWT_SECRET = settings.SECRET_KEY
+_JWT_ALGORITHM = settings.ALGORITHM
+_ACCESS_TOKEN_EXPIRE = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# Verified against when the email is unknown, so a failed login costs the same
+# whether or not the account exists and response times don't leak which
+# emails are registered.
+_DUMMY_HASH = password_hasher.hash("project-flow-dummy-password")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed one."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHash):
+        return False
 
 def get_password_hash(password: str) -> str:
     """Hashes a plain password."""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """
     Authenticates a user.
     - Fetches user by email.
-    - Verifies the provided password against the stored hash.
+    - Verifies the provided password against the stored hash, or against a
+      dummy hash if the user doesn't exist, to keep timing uniform.
+    - Rehashes the password if the stored hash uses outdated parameters,
+      leaving the user dirty in the session; the caller commits the change.
     """
     user = crud_user.get_user_by_email(db, email=email)
     if not user:
+        verify_password(password, _DUMMY_HASH)
         return None
     if not verify_password(password, user.password_hash):
         return None
+    if password_hasher.check_needs_rehash(user.password_hash):
+        user.password_hash = get_password_hash(password)
     return user
 
 def create_access_token(user: User, expires_delta: Optional[timedelta] = None) -> str:
@@ -37,16 +65,9 @@ def create_access_token(user: User, expires_delta: Optional[timedelta] = None) -
     Creates a new JWT access token.
     The 'sub' (subject) of the token will be the user's email.
     """
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+    expire = datetime.now(timezone.utc) + (expires_delta or _ACCESS_TOKEN_EXPIRE)
     # ** THE FIX IS HERE: Use user.email instead of user.id **
     to_encode = {"exp": expire, "sub": user.email}
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = jwt.encode(to_encode, _JWT_SECRET, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
@@ -1,9 +1,11 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import time
 from typing import List
 
 from ..crud import crud_project
-from ..db.models import Issue, IssueStatus, Issue 
+from ..db.models import Issue, IssueStatus, Project
 from ..schemas import admin as admin_schema
 
 def get_dashboard_data(db: Session) -> admin_schema.ExecutiveDashboardResponse:
@@ -47,12 +49,18 @@ def get_dashboard_data(db: Session) -> admin_schema.ExecutiveDashboardResponse:
     today = datetime.utcnow().date()
     next_week = today + timedelta(days=7)
     
-    upcoming_issues = db.query(Issue).filter(
-        Issue.due_date != None,
-        Issue.due_date >= today,
-        Issue.due_date <= next_week,
-        Issue.status != IssueStatus.DONE
-    ).order_by(Issue.due_date.asc()).limit(5).all()
+    # Only the columns the cards need, without building Issue objects
+    upcoming_issues = db.execute(
+        select(Issue.id, Issue.title, Issue.due_date)
+        .where(
+            Issue.due_date != None,
+            Issue.due_date >= today,
+            Issue.due_date <= next_week,
+            Issue.status != IssueStatus.DONE
+        )
+        .order_by(Issue.due_date.asc())
+        .limit(5)
+    ).all()
 
     deadlines_data = []
     for issue in upcoming_issues:
@@ -71,32 +79,39 @@ def get_dashboard_data(db: Session) -> admin_schema.ExecutiveDashboardResponse:
         ))
 
     # 4. --- Recent Activity (remains the same) ---
-    now = datetime.utcnow()
+    now_ts = int(time.time())
     
-    def format_time_ago(dt: datetime):
-        diff = now - dt
-        seconds = diff.total_seconds()
+    def format_time_ago(seconds: int):
         if seconds < 60:
-            return f"{int(seconds)} seconds ago"
+            return f"{seconds} seconds ago"
         elif seconds < 3600:
-            return f"{int(seconds // 60)} minutes ago"
+            return f"{seconds // 60} minutes ago"
         elif seconds < 86400:
-            return f"{int(seconds // 3600)} hours ago"
+            return f"{seconds // 3600} hours ago"
         else:
-            return f"{int(seconds // 86400)} days ago"
+            return f"{seconds // 86400} days ago"
 
-    recent_issues_query = db.query(Issue).options(
-        joinedload(Issue.project) 
-    ).order_by(Issue.created_at.desc()).limit(5)
-    recent_issues = recent_issues_query.all()
+    # created_at is stored as naive UTC; extracting the epoch in SQL avoids
+    # building datetimes and doing timedelta math per row
+    recent_issues = db.execute(
+        select(
+            Issue.id,
+            Issue.title,
+            func.extract("epoch", Issue.created_at).label("created_ts"),
+            Project.key.label("project_key"),
+        )
+        .join(Project, Issue.project_id == Project.id)
+        .order_by(Issue.created_at.desc())
+        .limit(5)
+    ).all()
     
     activities_data = []
     for issue in recent_issues:
         activities_data.append(admin_schema.Activity(
             id=str(issue.id),
             type=admin_schema.ActivityType.ASSIGNMENT, 
-            description=f"New issue '{issue.title}' created in {issue.project.key}",
-            time=format_time_ago(issue.created_at)
+            description=f"New issue '{issue.title}' created in {issue.project_key}",
+            time=format_time_ago(now_ts - int(issue.created_ts))
         ))
     
     if not activities_data:
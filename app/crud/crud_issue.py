@@ -1,32 +1,138 @@
 import uuid
-from sqlalchemy.orm import Session, joinedload
+from typing import Iterator
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 from ..schemas import issue as issue_schema
 
 # --- FIX: Import Enums from the db.models file to avoid conflicts ---
-from ..db.models import Issue, User
+from ..db.models import Issue, ProjectMember, User
 from ..db.models import IssueStatus as DB_IssueStatus
 from ..db.models import IssuePriority as DB_IssuePriority
 from ..db.models import IssueType as DB_IssueType
 
+# Maps schema enum fields to the DB enums their values are converted to
+_ENUM_CONVERTERS = {
+    "status": DB_IssueStatus,
+    "priority": DB_IssuePriority,
+    "issue_type": DB_IssueType,
+}
+
+# Maps updatable foreign key columns to the relationship they back
+_FK_RELATIONSHIPS = {
+    "assignee_id": "assignee",
+    "phase_id": "phase",
+}
+
 def get_issue(db: Session, issue_id: uuid.UUID) -> Issue | None:
     """
     Get a single issue by its ID, eagerly loading related user objects.
     """
-    return db.query(Issue).options(
-        joinedload(Issue.assignee),
-        joinedload(Issue.reporter),
-        joinedload(Issue.requester)
-    ).filter(Issue.id == issue_id).first()
+    stmt = (
+        select(Issue)
+        .options(
+            joinedload(Issue.assignee),
+            joinedload(Issue.reporter),
+            joinedload(Issue.requester)
+        )
+        .where(Issue.id == issue_id)
+    )
+    return db.scalars(stmt).first()
+
+def get_issue_with_member(
+    db: Session, issue_id: uuid.UUID, user_id: uuid.UUID
+) -> tuple[Issue | None, ProjectMember | None]:
+    """
+    Get an issue together with the user's membership in its project, in a
+    single query. The membership is None if the user isn't a member.
+    """
+    stmt = (
+        select(Issue, ProjectMember)
+        .outerjoin(
+            ProjectMember,
+            and_(ProjectMember.project_id == Issue.project_id, ProjectMember.user_id == user_id),
+        )
+        .options(
+            joinedload(Issue.assignee),
+            joinedload(Issue.reporter),
+            joinedload(Issue.requester)
+        )
+        .where(Issue.id == issue_id)
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
+
+def _project_issues_stmt(project_id: uuid.UUID, viewer_id: uuid.UUID | None, see_all_proposed: bool):
+    """
+    Builds the SELECT for a project's issues with their users batch-loaded,
+    limiting proposed issues to the viewer's own unless `see_all_proposed`.
+    Any other relationship access raises instead of lazy-loading per row,
+    following the same policy as the project list queries (see
+    crud_project._PROJECT_DETAILS_OPTIONS).
+    """
+    stmt = select(Issue).options(
+        selectinload(Issue.assignee),
+        selectinload(Issue.reporter),
+        selectinload(Issue.requester),
+        raiseload("*"),
+    ).where(Issue.project_id == project_id)
+
+    if not see_all_proposed:
+        stmt = stmt.where(
+            or_(Issue.status != DB_IssueStatus.PROPOSED, Issue.reporter_id == viewer_id)
+        )
+    return stmt
 
-def get_issues_by_project(db: Session, project_id: uuid.UUID) -> list[Issue]:
+def get_issues_by_project(
+    db: Session,
+    project_id: uuid.UUID,
+    skip: int = 0,
+    limit: int | None = None,
+    viewer_id: uuid.UUID | None = None,
+    see_all_proposed: bool = True,
+    after: uuid.UUID | None = None,
+) -> list[Issue]:
     """
-    Get all issues for a project, eagerly loading related user objects.
+    Get a page of issues for a project, eagerly loading related user objects.
+    The users are batch-loaded with one IN query per relation, so the issue
+    rows aren't widened by three user joins and each user is fetched once.
+    Unless `see_all_proposed` is set, proposed issues are limited to those
+    reported by `viewer_id`.
+    If `after` is the id of the last issue of the previous page, the page is
+    found by seeking past that issue's (created_at, id) instead of by offset.
     """
-    return db.query(Issue).options(
-        joinedload(Issue.assignee),
-        joinedload(Issue.reporter),
-        joinedload(Issue.requester)
-    ).filter(Issue.project_id == project_id).all()
+    stmt = _project_issues_stmt(project_id, viewer_id, see_all_proposed)
+
+    if after is not None:
+        cursor_ts = select(Issue.created_at).where(Issue.id == after).scalar_subquery()
+        stmt = stmt.where(
+            or_(Issue.created_at > cursor_ts, and_(Issue.created_at == cursor_ts, Issue.id > after))
+        )
+    else:
+        stmt = stmt.offset(skip)
+
+    return list(db.scalars(stmt.order_by(Issue.created_at, Issue.id).limit(limit)).all())
+
+def iter_issues_by_project(
+    db: Session,
+    project_id: uuid.UUID,
+    viewer_id: uuid.UUID | None = None,
+    see_all_proposed: bool = True,
+    batch_size: int = 500,
+) -> Iterator[Issue]:
+    """
+    Yields all of a project's issues in list order, visible to the viewer as
+    in `get_issues_by_project`. Rows come from a server-side cursor
+    `batch_size` at a time, with users batch-loaded per batch, so memory
+    stays bounded for large exports.
+    """
+    stmt = (
+        _project_issues_stmt(project_id, viewer_id, see_all_proposed)
+        .order_by(Issue.created_at, Issue.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.scalars(stmt)
 
 def create_issue(db: Session, issue_in: issue_schema.IssueCreate, reporter_id: uuid.UUID) -> Issue:
     """
@@ -45,9 +151,10 @@ def create_issue(db: Session, issue_in: issue_schema.IssueCreate, reporter_id: u
         due_date=issue_in.due_date,
         phase_id=issue_in.phase_id # <-- ADDED
     )
+    # Defaults (id, timestamps, enums) are client-side and already set on
+    # the instance after the flush, so no refresh SELECT is needed
     db.add(db_issue)
-    db.commit()
-    db.refresh(db_issue)
+    db.flush()
     return db_issue
 
 def update_issue(db: Session, db_obj: Issue, obj_in: issue_schema.IssueUpdate) -> Issue:
@@ -57,63 +164,68 @@ def update_issue(db: Session, db_obj: Issue, obj_in: issue_schema.IssueUpdate) -
     update_data = obj_in.model_dump(exclude_unset=True)
 
     for field, value in update_data.items():
-        # ... (enum conversion logic remains the same) ...
-        
-        # --- ADDED: Explicitly handle phase_id ---
-        if field == 'phase_id':
-            setattr(db_obj, 'phase_id', value)
-        elif field == 'status' and value is not None:
-            value = DB_IssueStatus(value.value)
-            setattr(db_obj, field, value)
-        elif field == 'priority' and value is not None:
-            value = DB_IssuePriority(value.value)
-            setattr(db_obj, field, value)
-        elif field == 'issue_type' and value is not None:
-            value = DB_IssueType(value.value)
-            setattr(db_obj, field, value)
-        else:
-             setattr(db_obj, field, value)
+        converter = _ENUM_CONVERTERS.get(field)
+        if converter is not None and value is not None:
+            value = converter(value.value)
+        setattr(db_obj, field, value)
 
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    db.flush()
+    # Setting a foreign key doesn't touch an already-loaded relationship, so
+    # expire the stale ones; they reload from the new key on next access
+    stale = [rel for fk, rel in _FK_RELATIONSHIPS.items() if fk in update_data]
+    if stale:
+        db.expire(db_obj, stale)
     return db_obj
 
 def delete_issue(db: Session, issue_id: uuid.UUID) -> Issue | None:
     """
     Delete an issue by its ID.
     """
-    db_issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    db_issue = db.get(Issue, issue_id)
     if db_issue:
         db.delete(db_issue)
-        db.commit()
+        db.flush()
     return db_issue
 
 # --- New functions for request workflow ---
 
-def request_issue(db: Session, issue: Issue, user: User) -> Issue:
-    """Set the user as the requester for an issue."""
-    issue.assignee_request_id = user.id
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
-    return issue
-
-def approve_request(db: Session, issue: Issue) -> Issue:
-    """Approve a request, making the requester the assignee."""
-    if issue.assignee_request_id:
-        issue.assignee_id = issue.assignee_request_id
-        issue.assignee_request_id = None
-        db.add(issue)
-        db.commit()
-        db.refresh(issue)
-    return issue
-
-def reject_request(db: Session, issue: Issue) -> Issue:
-    """Reject a request, clearing the requester field."""
-    issue.assignee_request_id = None
-    db.add(issue)
-    db.commit()
-    db.refresh(issue)
-    return issue
+def request_issue(db: Session, issue_id: uuid.UUID, user_id: uuid.UUID) -> Issue | None:
+    """
+    Set the user as the requester for an issue. The checks and the write are a
+    single conditional UPDATE, so concurrent requests can't both succeed.
+    Returns None if the issue doesn't exist, is assigned, or has a pending request.
+    """
+    stmt = (
+        update(Issue)
+        .where(Issue.id == issue_id, Issue.assignee_id.is_(None), Issue.assignee_request_id.is_(None))
+        .values(assignee_request_id=user_id)
+        .returning(Issue)
+    )
+    return db.scalars(stmt).first()
 
+def approve_request(db: Session, issue_id: uuid.UUID) -> Issue | None:
+    """
+    Approve a request, making the requester the assignee.
+    Returns None if the issue doesn't exist or has no pending request.
+    """
+    stmt = (
+        update(Issue)
+        .where(Issue.id == issue_id, Issue.assignee_request_id.is_not(None))
+        .values(assignee_id=Issue.assignee_request_id, assignee_request_id=None)
+        .returning(Issue)
+    )
+    return db.scalars(stmt).first()
+
+def reject_request(db: Session, issue_id: uuid.UUID) -> Issue | None:
+    """
+    Reject a request, clearing the requester field.
+    Returns None if the issue doesn't exist or has no pending request.
+    """
+    stmt = (
+        update(Issue)
+        .where(Issue.id == issue_id, Issue.assignee_request_id.is_not(None))
+        .values(assignee_request_id=None)
+        .returning(Issue)
+    )
+    return db.scalars(stmt).first()
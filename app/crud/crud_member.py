@@ -1,60 +1,127 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 from uuid import UUID
-from ..db.models import ProjectMember, ProjectRole
+from ..db.models import Issue, ProjectMember, ProjectRole, User
 
 
 def get_project_member(db: Session, project_id: UUID, user_id: UUID) -> ProjectMember | None:
-    return db.query(ProjectMember).filter(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id).first()
+    stmt = (
+        select(ProjectMember)
+        .options(joinedload(ProjectMember.user))
+        .where(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+def get_member_for_issue(db: Session, issue_id: UUID, user_id: UUID) -> tuple[UUID | None, ProjectMember | None]:
+    """
+    Resolves an issue's project and the user's membership in that project
+    with a single query. Returns (None, None) if the issue doesn't exist and
+    (project_id, None) if the user isn't a member.
+    """
+    stmt = (
+        select(Issue.project_id, ProjectMember)
+        .outerjoin(
+            ProjectMember,
+            and_(ProjectMember.project_id == Issue.project_id, ProjectMember.user_id == user_id),
+        )
+        .options(joinedload(ProjectMember.user))
+        .where(Issue.id == issue_id)
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
+
+def get_user_with_membership(
+    db: Session, project_id: UUID, user_id: UUID | None = None, email: str | None = None
+) -> tuple[User | None, ProjectMember | None]:
+    """
+    Loads a user, by ID or by email, together with their membership in a
+    project in a single query. Returns (user, None) if the user isn't a
+    member and (None, None) if the user doesn't exist.
+    """
+    stmt = select(User, ProjectMember).outerjoin(
+        ProjectMember,
+        and_(ProjectMember.user_id == User.id, ProjectMember.project_id == project_id),
+    )
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+    else:
+        stmt = stmt.where(User.email == email)
+    row = db.execute(stmt).first()
+    if row is None:
+        return None, None
+    return row[0], row[1]
 
 def get_project_members(db: Session, project_id: UUID) -> list[ProjectMember]:
-    return db.query(ProjectMember).filter(ProjectMember.project_id == project_id).all()
+    """
+    Get all members of a project, batch-loading their users in one extra query.
+    """
+    stmt = (
+        select(ProjectMember)
+        .options(selectinload(ProjectMember.user))
+        .where(ProjectMember.project_id == project_id)
+    )
+    return list(db.scalars(stmt).all())
+
+def count_leads(db: Session, project_id: UUID) -> int:
+    """
+    Counts the Project Leads of a project without loading the member rows.
+    """
+    stmt = select(func.count(ProjectMember.user_id)).where(
+        ProjectMember.project_id == project_id,
+        ProjectMember.role == ProjectRole.PROJECT_LEAD,
+    )
+    return db.execute(stmt).scalar_one()
 
-def add_project_member(db: Session, project_id: UUID, user_id: UUID, role: ProjectRole) -> ProjectMember:
+def add_project_member(db: Session, project_id: UUID, user_id: UUID, role: ProjectRole) -> ProjectMember | None:
     """
     Adds a user to a project by their ID.
-    Assumes the user already exists.
+    Assumes the user already exists. Returns None if the user is already a member.
     """
-    db_member = ProjectMember(
-        project_id=project_id,
-        user_id=user_id,
-        role=role,
+    stmt = (
+        pg_insert(ProjectMember)
+        .values(project_id=project_id, user_id=user_id, role=role)
+        .on_conflict_do_nothing(index_elements=[ProjectMember.project_id, ProjectMember.user_id])
+        .returning(ProjectMember)
     )
-    db.add(db_member)
-    db.commit()
-    db.refresh(db_member)
-    return db_member
+    return db.scalars(stmt).first()
 
 def remove_project_member(db: Session, project_id: UUID, user_id: UUID) -> ProjectMember | None:
     db_member = get_project_member(db, project_id=project_id, user_id=user_id)
     if db_member:
         db.delete(db_member)
-        db.commit()
+        db.flush()
     return db_member
 
+def demote_project_leads(db: Session, project_id: UUID, except_user_id: UUID | None = None) -> None:
+    """
+    Demotes the project's Project Lead(s) to Member with a single UPDATE,
+    optionally sparing one user.
+    """
+    stmt = update(ProjectMember).where(
+        ProjectMember.project_id == project_id,
+        ProjectMember.role == ProjectRole.PROJECT_LEAD,
+    )
+    if except_user_id is not None:
+        stmt = stmt.where(ProjectMember.user_id != except_user_id)
+    db.execute(stmt.values(role=ProjectRole.MEMBER))
+
 def update_member_role(db: Session, project_id: UUID, user_id: UUID, new_role: ProjectRole) -> ProjectMember | None:
     """
     Updates a member's role. If the new role is Project Lead, it automatically
     demotes the existing Project Lead to a Member to enforce a single Project Lead per project.
     """
-    db_member = get_project_member(db, project_id=project_id, user_id=user_id)
+    # Usually already in the session, loaded by the route's path dependency
+    db_member = db.get(ProjectMember, (user_id, project_id))
     if db_member:
         # Enforce a single Project Lead per project
         if new_role == ProjectRole.PROJECT_LEAD:
-            current_lead = (
-                db.query(ProjectMember)
-                .filter(
-                    ProjectMember.project_id == project_id,
-                    ProjectMember.role == ProjectRole.PROJECT_LEAD,
-                )
-                .first()
-            )
-            if current_lead and current_lead.user_id != user_id:
-                current_lead.role = ProjectRole.MEMBER
-                db.add(current_lead)
+            demote_project_leads(db, project_id=project_id, except_user_id=user_id)
 
         db_member.role = new_role
         db.add(db_member)
-        db.commit()
-        db.refresh(db_member)
+        db.flush()
     return db_member
 
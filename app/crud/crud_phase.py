@@ -1,13 +1,14 @@
 import uuid
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, update
 from typing import List
 
 from ..db.models import Phase,PhaseStatus
 from ..schemas.phase import PhaseCreate, PhaseUpdate, PhaseOrderUpdate
 
 def get_phase(db: Session, phase_id: uuid.UUID) -> Phase | None:
-    return db.query(Phase).filter(Phase.id == phase_id).first()
+    # Served from the session's identity map when the role check already loaded it
+    return db.get(Phase, phase_id)
 
 def get_phases_by_project(db: Session, project_id: uuid.UUID) -> List[Phase]:
     return db.query(Phase).filter(Phase.project_id == project_id).order_by(Phase.order).all()
@@ -22,8 +23,7 @@ def create_phase(db: Session, project_id: uuid.UUID, phase_in: PhaseCreate) -> P
         order=max_order + 1
     )
     db.add(db_phase)
-    db.commit()
-    db.refresh(db_phase)
+    db.flush()
     return db_phase
 
 def update_phase(db: Session, db_phase: Phase, phase_in: PhaseUpdate) -> Phase:
@@ -32,40 +32,40 @@ def update_phase(db: Session, db_phase: Phase, phase_in: PhaseUpdate) -> Phase:
         setattr(db_phase, field, value)
     
     db.add(db_phase)
-    db.commit()
-    db.refresh(db_phase)
+    db.flush()
     return db_phase
 
 def delete_phase(db: Session, phase_id: uuid.UUID) -> Phase | None:
     db_phase = get_phase(db, phase_id=phase_id)
     if db_phase:
         db.delete(db_phase)
-        db.commit()
+        db.flush()
     return db_phase
 
 def update_phases_order(db: Session, project_id: uuid.UUID, order_updates: List[PhaseOrderUpdate]):
-    # Update orders in a bulk fashion
-    for update in order_updates:
-        db.query(Phase).filter(
-            Phase.id == update.id,
-            Phase.project_id == project_id
-        ).update({"order": update.order})
+    # Update all orders with a single UPDATE ... SET "order" = CASE id ... END
+    new_orders = {u.id: u.order for u in order_updates}
+    if new_orders:
+        db.execute(
+            update(Phase)
+            .where(Phase.project_id == project_id, Phase.id.in_(new_orders))
+            .values(order=case(new_orders, value=Phase.id))
+            .execution_options(synchronize_session="fetch")
+        )
     
-    db.commit()
+    db.flush()
     return get_phases_by_project(db, project_id=project_id)
 
 def start_phase(db: Session, db_phase: Phase) -> Phase:
     """Marks a phase as IN_PROGRESS."""
     db_phase.status = PhaseStatus.IN_PROGRESS
     db.add(db_phase)
-    db.commit()
-    db.refresh(db_phase)
+    db.flush()
     return db_phase
 
 def complete_phase(db: Session, db_phase: Phase) -> Phase:
     """Marks a phase as COMPLETED."""
     db_phase.status = PhaseStatus.COMPLETED
     db.add(db_phase)
-    db.commit()
-    db.refresh(db_phase)
+    db.flush()
     return db_phase
\ No newline at end of file
@@ -1,36 +1,61 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.orm import Session, raiseload, selectinload
 from fastapi import HTTPException, status
 from ..db.models import Project, ProjectMember, ProjectRole, IssueStatus, User, Issue, Phase
 from ..schemas import project as project_schema
 from ..schemas import phase as phase_schema
-from typing import List
+from collections import Counter
+from typing import Iterator, List
+import uuid
 from . import crud_user
 
-def calculate_phase_progress(phase: Phase, all_project_issues: List[Issue]) -> float:
+def count_issues(issues: List[Issue]) -> tuple[Counter, dict[uuid.UUID, tuple[int, int]]]:
+    """
+    Tallies a project's issues in a single pass.
+    Returns the issue count per status and a (done, total) pair per phase id.
+    """
+    by_status: Counter = Counter()
+    by_phase: dict[uuid.UUID, tuple[int, int]] = {}
+    # Loaded statuses are always IssueStatus members, so identity checks
+    # stand in for the str-enum __eq__ in this per-issue loop
+    DONE = IssueStatus.DONE
+    for issue in issues:
+        issue_status = issue.status
+        by_status[issue_status] += 1
+        phase_id = issue.phase_id
+        if phase_id is not None:
+            done, total = by_phase.get(phase_id, (0, 0))
+            by_phase[phase_id] = (done + (issue_status is DONE), total + 1)
+    return by_status, by_phase
+
+def calculate_phase_progress(phase: Phase, phase_counts: dict[uuid.UUID, tuple[int, int]]) -> float:
     """
     Calculates phase progress based on its associated issues.
     (Done Issues / Total Issues * 100.0)
+    `phase_counts` maps phase ids to (done, total) issue counts, see `count_issues`.
     """
-    issues_in_phase = [i for i in all_project_issues if i.phase_id == phase.id]
-    
-    total_issues = len(issues_in_phase)
+    done_issues, total_issues = phase_counts.get(phase.id, (0, 0))
     if total_issues == 0:
         # If no issues, the phase is considered 100% complete only if manually marked complete
         return 100.0 if phase.status == "COMPLETED" else 0.0
 
-    done_issues = sum(1 for i in issues_in_phase if i.status == IssueStatus.DONE)
     return (done_issues / total_issues * 100.0)
 
-def calculate_project_progress_by_phases(project_phases: List[Phase], all_project_issues: List[Issue]) -> float:
+def calculate_project_progress_by_phases(
+    project_phases: List[Phase],
+    status_counts: Counter,
+    phase_counts: dict[uuid.UUID, tuple[int, int]],
+) -> float:
     """
     Calculates overall project progress.
     (Completed Phases / Total Phases * 100.0)
     A phase is counted as Completed if its calculated progress is 100% (rounded).
+    Takes the per-status and per-phase issue counts from `count_issues`.
     """
     if not project_phases:
         # Fallback to issue-based progress for projects without phases
-        total_active_issues = sum(1 for i in all_project_issues if i.status != IssueStatus.PROPOSED)
-        done_issues = sum(1 for i in all_project_issues if i.status == IssueStatus.DONE)
+        total_active_issues = sum(status_counts.values()) - status_counts[IssueStatus.PROPOSED]
+        done_issues = status_counts[IssueStatus.DONE]
         return (done_issues / total_active_issues * 100.0) if total_active_issues > 0 else 0.0
 
     total_phases = len(project_phases)
@@ -38,7 +63,7 @@ def calculate_project_progress_by_phases(project_phases: List[Phase], all_projec
     
     for phase in project_phases:
         # Calculate the phase's progress based on its issues
-        phase_progress = calculate_phase_progress(phase, all_project_issues)
+        phase_progress = calculate_phase_progress(phase, phase_counts)
         
         # If phase progress is 100% (or more due to float math/rounding), count it as completed
         if round(phase_progress) >= 100.0:
@@ -49,24 +74,25 @@ def calculate_project_progress_by_phases(project_phases: List[Phase], all_projec
 
 
 def _build_project_details(project: Project) -> project_schema.ProjectWithDetails:
+    status_counts, phase_counts = count_issues(project.issues)
     issue_summary = {
-        "total": sum(1 for i in project.issues if i.status != IssueStatus.PROPOSED),
-        "todo": sum(1 for i in project.issues if i.status == IssueStatus.TO_DO),
-        "in_progress": sum(1 for i in project.issues if i.status == IssueStatus.IN_PROGRESS),
-        "in_review": sum(1 for i in project.issues if i.status == IssueStatus.IN_REVIEW),
-        "done": sum(1 for i in project.issues if i.status == IssueStatus.DONE),
+        "total": sum(status_counts.values()) - status_counts[IssueStatus.PROPOSED],
+        "todo": status_counts[IssueStatus.TO_DO],
+        "in_progress": status_counts[IssueStatus.IN_PROGRESS],
+        "in_review": status_counts[IssueStatus.IN_REVIEW],
+        "done": status_counts[IssueStatus.DONE],
     }
 
     project_lead_member = next((m for m in project.memberships if m.role == ProjectRole.PROJECT_LEAD), None)
     project_lead = project_lead_member.user if project_lead_member else None
     
     # 1. Calculate overall project progress (User Request 1 & 3)
-    progress = calculate_project_progress_by_phases(project.phases, project.issues)
+    progress = calculate_project_progress_by_phases(project.phases, status_counts, phase_counts)
 
     # 2. Build phases list with individual progress (User Request 3)
     phases_with_progress: List[phase_schema.Phase] = []
     for phase in project.phases:
-        phase_progress_value = calculate_phase_progress(phase, project.issues)
+        phase_progress_value = calculate_phase_progress(phase, phase_counts)
         
         # Manually create the Phase schema object to include the calculated progress
         phases_with_progress.append(
@@ -97,49 +123,78 @@ def _build_project_details(project: Project) -> project_schema.ProjectWithDetail
         phases=phases_with_progress, # <-- Phases now have progress
         phase_progress=progress)
 
-def get_project(db: Session, project_id: str):
+# Loader options for everything _build_project_details reads. List queries
+# eager-load exactly what their response schema reads and raiseload the rest,
+# so a schema that starts reading another relationship fails loudly until
+# its loader is added here, instead of lazy-loading once per row.
+_PROJECT_DETAILS_OPTIONS = (
+    selectinload(Project.memberships).selectinload(ProjectMember.user),
+    selectinload(Project.issues).options(
+        selectinload(Issue.assignee),
+        selectinload(Issue.reporter),
+        selectinload(Issue.requester),
+        raiseload("*"),
+    ),
+    selectinload(Project.phases),
+    raiseload("*"),
+)
+
+def get_project(db: Session, project_id: uuid.UUID):
     """
     Get a single project by its ID.
     """
     return db.query(Project).filter(Project.id == project_id).first()
 
-def get_projects_for_user(db: Session, user_id: str) -> List[project_schema.ProjectWithDetails]:
+def get_projects_for_user(
+    db: Session, user_id: uuid.UUID, skip: int = 0, limit: int | None = None
+) -> List[project_schema.ProjectWithDetails]:
     """
-    Get all projects a user is a member of.
+    Get a page of the projects a user is a member of.
     """
     projects = (
         db.query(Project)
-        .options(
-            joinedload(Project.memberships).joinedload(ProjectMember.user),
-            joinedload(Project.issues).joinedload(Issue.assignee),
-            joinedload(Project.issues).joinedload(Issue.reporter),
-            joinedload(Project.issues).joinedload(Issue.requester),
-            joinedload(Project.phases) # <-- 3. EAGER LOAD PHASES
-        )
+        .options(*_PROJECT_DETAILS_OPTIONS)
         .join(ProjectMember)
         .filter(ProjectMember.user_id == user_id)
+        .order_by(Project.created_at, Project.id)
+        .offset(skip)
+        .limit(limit)
         .all()
     )
     return [_build_project_details(p) for p in projects]
 
-def get_all_projects(db: Session) -> List[project_schema.ProjectWithDetails]:
+def get_all_projects(
+    db: Session, skip: int = 0, limit: int | None = None
+) -> List[project_schema.ProjectWithDetails]:
     """
-    Get all projects in the database. Intended for superusers.
+    Get all projects in the database, optionally paginated. Intended for superusers.
     """
     projects = (
         db.query(Project)
-        .options(
-            joinedload(Project.memberships).joinedload(ProjectMember.user),
-            joinedload(Project.issues).joinedload(Issue.assignee),
-            joinedload(Project.issues).joinedload(Issue.reporter),
-            joinedload(Project.issues).joinedload(Issue.requester),
-            joinedload(Project.phases) # <-- 4. EAGER LOAD PHASES
-        )
+        .options(*_PROJECT_DETAILS_OPTIONS)
+        .order_by(Project.created_at, Project.id)
+        .offset(skip)
+        .limit(limit)
         .all()
     )
     return [_build_project_details(p) for p in projects]
 
-def create_project(db: Session, project_in: project_schema.ProjectCreate, admin_user_id: str) -> Project:
+def iter_all_projects(db: Session, batch_size: int = 100) -> Iterator[project_schema.ProjectWithDetails]:
+    """
+    Yields every project with its details, in list order. Projects come from a
+    server-side cursor `batch_size` at a time with their related rows
+    batch-loaded per batch, so memory stays bounded on large deployments.
+    """
+    stmt = (
+        select(Project)
+        .options(*_PROJECT_DETAILS_OPTIONS)
+        .order_by(Project.created_at, Project.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for project in db.scalars(stmt):
+        yield _build_project_details(project)
+
+def create_project(db: Session, project_in: project_schema.ProjectCreate, admin_user_id: uuid.UUID) -> Project:
     """
     Create a new project, assign a project lead, and add members.
     """
@@ -152,41 +207,48 @@ def create_project(db: Session, project_in: project_schema.ProjectCreate, admin_
     db.add(db_project)
     db.flush()  # Flush to get the db_project.id for the member entries
 
+    # Resolve the lead and all member emails with a single query
+    # The schema has already deduplicated members and removed the lead
+    member_emails = project_in.members
+    lookup_emails = set(member_emails)
+    if project_in.project_lead_email:
+        lookup_emails.add(project_in.project_lead_email)
+    users_by_email = crud_user.get_users_by_emails(db, emails=lookup_emails)
+
     # Determine and assign the Project Lead
     project_lead_id = None
     if project_in.project_lead_email:
-        project_lead_user = crud_user.get_user_by_email(db, email=project_in.project_lead_email)
+        project_lead_user = users_by_email.get(project_in.project_lead_email)
         if not project_lead_user:
             raise HTTPException(status_code=404, detail=f"Project lead with email {project_in.project_lead_email} not found.")
         project_lead_id = project_lead_user.id
-        db.add(ProjectMember(project_id=db_project.id, user_id=project_lead_id, role=ProjectRole.PROJECT_LEAD))
     else:
         # Default to the creating admin if no lead is specified
         project_lead_id = admin_user_id
-        db.add(ProjectMember(project_id=db_project.id, user_id=admin_user_id, role=ProjectRole.PROJECT_LEAD))
-
-    # Add other members
-    if project_in.members:
-        for member_email in set(project_in.members): # Use set to avoid duplicate entries
-            member_user = crud_user.get_user_by_email(db, email=member_email)
-            if member_user:
-                # Add as a member only if they are not already the project lead
-                if member_user.id != project_lead_id:
-                    db.add(ProjectMember(project_id=db_project.id, user_id=member_user.id, role=ProjectRole.MEMBER))
-            # Note: We could raise an error here if a member email is not found,
-            # but for now, we'll just skip non-existent users silently.
-    
-    db.commit()
-    db.refresh(db_project)
+    memberships = [ProjectMember(project_id=db_project.id, user_id=project_lead_id, role=ProjectRole.PROJECT_LEAD)]
+
+    # Add other members, skipping the creating admin when they default to lead.
+    # Note: We could raise an error here if a member email is not found,
+    # but for now, we'll just skip non-existent users silently.
+    memberships.extend(
+        ProjectMember(project_id=db_project.id, user_id=user.id, role=ProjectRole.MEMBER)
+        for user in (users_by_email.get(email) for email in member_emails)
+        if user and user.id != project_lead_id
+    )
+
+    db.add_all(memberships)
+    # id and created_at are client-side defaults, already set on the instance
+    # after the first flush, so no refresh SELECT is needed
+    db.flush()
     return db_project
 
 
-def delete_project(db: Session, project_id: str):
+def delete_project(db: Session, project_id: uuid.UUID):
     """
     Delete a project by its ID.
     """
     project = db.query(Project).filter(Project.id == project_id).first()
     if project:
         db.delete(project)
-        db.commit()
+        db.flush()
     return project
\ No newline at end of file
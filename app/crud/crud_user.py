@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Iterator
 import uuid
 from ..db.models import User
 from ..schemas.user import UserCreate, UserUpdate, UserAdminFullUpdate # <-- 1. IMPORT
@@ -11,51 +13,118 @@ def get_user(db: Session, user_id: uuid.UUID) -> User | None:
 
 def get_user_by_email(db: Session, email: str) -> User | None:
     """Gets a user from the database by their email address."""
-    result = db.execute(select(User).filter(User.email == email))
-    return result.scalars().first()
+    return db.scalar(select(User).filter(User.email == email))
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
-    """Gets all users from the database."""
-    result = db.execute(select(User).offset(skip).limit(limit))
-    return list(result.scalars().all())
+def get_users_by_emails(db: Session, emails: set[str]) -> dict[str, User]:
+    """Gets the users with the given email addresses in one query, keyed by email."""
+    if not emails:
+        return {}
+    result = db.execute(select(User).filter(User.email.in_(emails)))
+    return {user.email: user for user in result.scalars()}
 
-def create_user(db: Session, user_in: UserCreate) -> User:
-    """Creates a new user in the database."""
+def get_user_and_email_owner(
+    db: Session, user_id: uuid.UUID, email: str
+) -> tuple[User | None, User | None]:
+    """
+    Gets a user by ID and, in the same query, whichever user owns `email`.
+    Either may be None; both are the same object if the user owns the email.
+    """
+    result = db.execute(select(User).where(or_(User.id == user_id, User.email == email)))
+    by_id = by_email = None
+    for user in result.scalars():
+        if user.id == user_id:
+            by_id = user
+        if user.email == email:
+            by_email = user
+    return by_id, by_email
+
+def get_users(
+    db: Session, skip: int = 0, limit: int = 100, after: uuid.UUID | None = None
+) -> list[User]:
+    """
+    Gets a page of users, ordered for stable pagination.
+    If `after` is the id of the last user of the previous page, the page is
+    found by seeking past that user's (created_at, id) instead of by offset.
+    """
+    stmt = select(User).order_by(User.created_at, User.id)
+    if after is not None:
+        cursor_ts = select(User.created_at).where(User.id == after).scalar_subquery()
+        stmt = stmt.where(
+            or_(User.created_at > cursor_ts, and_(User.created_at == cursor_ts, User.id > after))
+        )
+    else:
+        stmt = stmt.offset(skip)
+    return list(db.scalars(stmt.limit(limit)).all())
+
+def iter_users(db: Session, batch_size: int = 500) -> Iterator[User]:
+    """
+    Yields every user in list order, fetching them from a server-side cursor
+    `batch_size` rows at a time so memory stays bounded for large exports.
+    """
+    stmt = select(User).order_by(User.created_at, User.id).execution_options(yield_per=batch_size)
+    yield from db.scalars(stmt)
+
+def create_user(db: Session, user_in: UserCreate) -> User | None:
+    """
+    Creates a new user in the database.
+    Returns None if a user with this email already exists.
+    """
     hashed_password = get_password_hash(user_in.password)
-    db_user = User(
-        email=user_in.email,
-        full_name=user_in.full_name,
-        password_hash=hashed_password,
+    stmt = (
+        pg_insert(User)
+        .values(
+            email=user_in.email,
+            full_name=user_in.full_name,
+            password_hash=hashed_password,
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return db.scalars(stmt).first()
 
-# --- MODIFIED FUNCTION ---
-def update_user(db: Session, db_user: User, user_in: UserUpdate | UserAdminFullUpdate) -> User: # <-- 2. UPDATE TYPE HINT
-    """Updates a user's information."""
+def _update_values(user_in: UserUpdate | UserAdminFullUpdate) -> dict:
+    """Column values for a user update, with any new password hashed."""
     update_data = user_in.model_dump(exclude_unset=True)
 
     # --- 3. ADDED PASSWORD HANDLING ---
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data["password"])
-        setattr(db_user, "password_hash", hashed_password)
-        del update_data["password"] # Don't try to set 'password' attribute
+        # Don't try to set 'password' attribute
+        update_data["password_hash"] = get_password_hash(update_data.pop("password"))
     # --- END OF ADDED LOGIC ---
+    return update_data
 
-    for field, value in update_data.items():
+# --- MODIFIED FUNCTION ---
+def update_user(db: Session, db_user: User, user_in: UserUpdate | UserAdminFullUpdate) -> User: # <-- 2. UPDATE TYPE HINT
+    """Updates a user's information."""
+    for field, value in _update_values(user_in).items():
         setattr(db_user, field, value)
-    
+
+    # No server-side defaults on users, so the instance is already current
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
+def update_user_by_id(db: Session, user_id: uuid.UUID, user_in: UserUpdate | UserAdminFullUpdate) -> User | None:
+    """
+    Updates a user's information with a single UPDATE ... RETURNING, for
+    callers that haven't loaded the user. Returns None if the user doesn't exist.
+    """
+    return update_user_fields(db, user_id=user_id, values=_update_values(user_in))
+
+def update_user_fields(db: Session, user_id: uuid.UUID, values: dict) -> User | None:
+    """
+    Updates columns of a user with a single UPDATE ... RETURNING, without
+    loading the row first. Returns None if the user doesn't exist.
+    """
+    if not values:
+        return get_user(db, user_id=user_id)
+    stmt = update(User).where(User.id == user_id).values(**values).returning(User)
+    return db.scalars(stmt).first()
+
 def delete_user(db: Session, user_id: uuid.UUID) -> User | None:
     """Deletes a user from the database by their ID."""
     db_user = get_user(db, user_id=user_id)
     if db_user:
         db.delete(db_user)
-        db.commit()
+        db.flush()
     return db_user
\ No newline at end of file
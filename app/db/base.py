@@ -1,20 +1,54 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from ..core.config import settings
 
 # Create the synchronous SQLAlchemy engine
-# pool_recycle=1800 ensures connections are recycled every 30 minutes,
-# preventing timeout errors with services like Supabase.
-engine = create_engine(
-    settings.DATABASE_URL,
+# pool_recycle (30 minutes by default) ensures connections are recycled
+# before timeout errors with services like Supabase.
+# pool_use_lifo hands out the most recently used connection first, so under
+# light load the surplus connections sit idle and get recycled instead of
+# each being kept warm by round-robin checkouts.
+_pool_options = dict(
     pool_pre_ping=True,
-    pool_recycle=1800
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_use_lifo=True,
 )
+engine = create_engine(settings.DATABASE_URL, **_pool_options)
+
+# Read-only endpoints go to the replica when one is configured; otherwise
+# they share the primary engine and its pool, so no second pool is opened.
+read_engine = (
+    create_engine(settings.DATABASE_READ_URL, **_pool_options)
+    if settings.DATABASE_READ_URL
+    else engine
+)
+
+def _set_statement_timeout(dbapi_connection, connection_record):
+    """
+    Sets the statement timeout on each new connection. Sent as a SET rather
+    than a startup `options` parameter, which the Supabase transaction pooler
+    rejects; committed so the pool's reset-on-return rollback keeps it.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+    cursor.close()
+    dbapi_connection.commit()
+
+if settings.DB_STATEMENT_TIMEOUT_MS:
+    for _engine in {engine, read_engine}:
+        event.listen(_engine, "connect", _set_statement_timeout)
 
 # Create a configured "Session" class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps objects returned by the CRUD layer usable after
+# commit without each attribute access triggering a fresh SELECT.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
+)
 
 # Base class for our SQLAlchemy models
 Base = declarative_base()
-
-
@@ -0,0 +1,50 @@
+from sqlalchemy import func, select
+from .base import Base, engine, SessionLocal
+from ..crud import crud_user
+from ..schemas.user import UserCreate
+
+# Arbitrary application-wide key for the bootstrap advisory lock
+_BOOTSTRAP_LOCK_ID = 0x50_46_42_53  # "PFBS"
+
+def bootstrap() -> None:
+    """
+    Creates the database tables and the default admin user if they don't
+    exist yet. Safe to run repeatedly and from several processes at once:
+    everything runs in one transaction holding a Postgres advisory lock, so
+    concurrent runs wait for each other instead of racing on the DDL.
+    Run it once per deploy with `python -m app.db.bootstrap`.
+    """
+    with engine.begin() as conn:
+        # Released when the transaction commits
+        conn.execute(select(func.pg_advisory_xact_lock(_BOOTSTRAP_LOCK_ID)))
+
+        Base.metadata.create_all(bind=conn)
+        print("Database tables created.")
+
+        # The session joins the outer transaction; its commit doesn't end it
+        db = SessionLocal(bind=conn)
+        try:
+            # Check if user exists
+            user = crud_user.get_user_by_email(db, email="admin@ceat.com")
+            if not user:
+                # Create user data
+                user_in = UserCreate(
+                    email="admin@ceat.com",
+                    full_name="Admin User",
+                    password="admin@123" # Set default password to 'admin'
+                )
+                # Create the user (None if another worker created it first)
+                user = crud_user.create_user(db, user_in=user_in)
+                if user:
+                    # --- IMPORTANT: Elevate user to superuser ---
+                    user.is_superuser = True
+                    db.add(user)
+                    db.commit()
+                    print("Default admin user (admin@ceat.com) created.")
+            else:
+                print("Admin user already exists.")
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    bootstrap()
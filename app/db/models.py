@@ -3,7 +3,7 @@ import enum
 from datetime import datetime
 from sqlalchemy import (
     Column, String, DateTime, ForeignKey, Enum as SQLAlchemyEnum,
-    Boolean, Table, Date, Integer
+    Boolean, Table, Date, Integer, Index, text
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -43,6 +43,11 @@ class PhaseStatus(str, enum.Enum):
 
 class Phase(Base):
     __tablename__ = "phases"
+    __table_args__ = (
+        # Serves per-project phase lists ordered by `order`, the max(order)
+        # lookup on create, and the batched load of project phases
+        Index("ix_phases_project_order", "project_id", "order"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -58,6 +63,10 @@ class Phase(Base):
 
 class ProjectMember(Base):
     __tablename__ = 'project_members'
+    __table_args__ = (
+        # Serves the Project Lead lookups (lead demotion, last-lead checks)
+        Index("ix_project_members_project_role", "project_id", "role"),
+    )
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete="CASCADE"), primary_key=True)
     project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete="CASCADE"), primary_key=True)
     role = Column(SQLAlchemyEnum(ProjectRole), nullable=False, default=ProjectRole.MEMBER)
@@ -69,6 +78,10 @@ class ProjectMember(Base):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Serves the (created_at, id) ordering and cursor seeks of the user list
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -108,6 +121,25 @@ class Project(Base):
 
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        # Serves per-project listings ordered by (created_at, id) and their
+        # cursor seeks; also covers plain project_id lookups.
+        Index("ix_issues_project_created_at_id", "project_id", "created_at", "id"),
+        # Serve the two branches of the MEMBER view filter:
+        # non-proposed issues, and proposals the member reported
+        Index(
+            "ix_issues_project_active",
+            "project_id", "created_at", "id",
+            postgresql_where=text("status <> 'PROPOSED'"),
+        ),
+        Index("ix_issues_project_reporter", "project_id", "reporter_id"),
+        # Dashboard: open issues due soon, and the most recently created issues
+        Index("ix_issues_open_due_date", "due_date", postgresql_where=text("status <> 'DONE'")),
+        Index("ix_issues_created_at", "created_at"),
+        # Deleting a phase nulls its issues' phase_id (ORM cascade and
+        # ON DELETE SET NULL); without this both scan the whole table
+        Index("ix_issues_phase_id", "phase_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
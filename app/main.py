@@ -1,47 +1,27 @@
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .db.base import Base, engine, SessionLocal # <-- 1. IMPORT SessionLocal
+from .core.config import settings
+from .db.base import engine
+from .db.bootstrap import bootstrap
 from .api.routers import auth, projects, issues, members, admin, phases
 
-# --- 2. NEW IMPORTS for default user creation ---
-from .crud import crud_user
-from .schemas.user import UserCreate
-from .db.models import User
-# --- END NEW IMPORTS ---
-
-app = FastAPI()
-
-@app.on_event("startup")
-def on_startup():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     print("Application startup...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created.")
+    # Sync endpoints run on anyio's worker threads; size that pool explicitly.
+    # Threads that need a database connection share the smaller DB pool.
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    # Schema and default admin setup; deployments that run
+    # `python -m app.db.bootstrap` once can turn this off so every worker
+    # boots without touching the database. Runs on a worker thread so its
+    # blocking I/O stays off the event loop.
+    if settings.BOOTSTRAP_ON_STARTUP:
+        await to_thread.run_sync(bootstrap)
+    yield
 
-    # --- 3. NEW: Create default admin user ---
-    db = SessionLocal()
-    try:
-        # Check if user exists
-        user = crud_user.get_user_by_email(db, email="admin@ceat.com")
-        if not user:
-            # Create user data
-            user_in = UserCreate(
-                email="admin@ceat.com",
-                full_name="Admin User",
-                password="admin@123" # Set default password to 'admin'
-            )
-            # Create the user
-            user = crud_user.create_user(db, user_in=user_in)
-            
-            # --- IMPORTANT: Elevate user to superuser ---
-            user.is_superuser = True
-            db.add(user)
-            db.commit()
-            print("Default admin user (admin@ceat.com) created.")
-        else:
-            print("Admin user already exists.")
-    finally:
-        db.close()
-    # --- END OF NEW LOGIC ---
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",
@@ -49,12 +29,15 @@ origins = [
     "https://project-flow-frontend.onrender.com",
 ]
 
+# max_age lets browsers reuse a preflight answer instead of sending an
+# OPTIONS request ahead of every cross-origin call (browsers cap it lower).
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 # Include API routers with specific prefixes
@@ -67,4 +50,21 @@ app.include_router(phases.router, prefix="/api", tags=["Phases"])
 
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to the ProjectFlow API!"}
\ No newline at end of file
+    return {"message": "Welcome to the ProjectFlow API!"}
+
+@app.get("/healthz")
+def healthz():
+    """
+    Liveness check that also reports connection pool usage, so pool
+    saturation is visible without attaching to the database.
+    """
+    pool = engine.pool
+    return {
+        "status": "ok",
+        "pool": {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        },
+    }
@@ -1,5 +1,5 @@
 import uuid
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, model_validator
 from datetime import datetime
 from typing import Optional, Annotated, List
 
@@ -19,6 +19,14 @@ class ProjectCreate(ProjectBase):
     project_lead_email: Optional[EmailStr] = None
     members: Optional[List[EmailStr]] = []
 
+    @model_validator(mode="after")
+    def dedupe_members(self):
+        # Members are unique and never include the lead, who is added separately
+        members = dict.fromkeys(self.members or [])
+        members.pop(self.project_lead_email, None)
+        self.members = list(members)
+        return self
+
 # Properties to receive on project update
 class ProjectUpdate(ProjectBase):
     pass